@@ -11,7 +11,7 @@ from datetime import time
 from typing import Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class ConnectionConfig:
     """Configuration for IBKR API connection."""
     host: str = "127.0.0.1"
@@ -23,11 +23,13 @@ class ConnectionConfig:
     @classmethod
     def from_env(cls) -> 'ConnectionConfig':
         """Create configuration from environment variables."""
+        # Slotted class attributes are descriptors, so read defaults off an instance
+        defaults = cls()
         return cls(
-            host=os.getenv('IBKR_HOST', cls.host),
-            port=int(os.getenv('IBKR_PORT', cls.port)),
-            client_id=int(os.getenv('IBKR_CLIENT_ID', cls.client_id)),
-            timeout=float(os.getenv('IBKR_TIMEOUT', cls.timeout)),
+            host=os.getenv('IBKR_HOST', defaults.host),
+            port=int(os.getenv('IBKR_PORT', defaults.port)),
+            client_id=int(os.getenv('IBKR_CLIENT_ID', defaults.client_id)),
+            timeout=float(os.getenv('IBKR_TIMEOUT', defaults.timeout)),
             account=os.getenv('IBKR_ACCOUNT')
         )
 
@@ -106,7 +108,7 @@ class LoggingConfig:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class Config:
     """Main configuration container."""
     connection: ConnectionConfig = field(default_factory=ConnectionConfig)
@@ -37,14 +37,20 @@ class ConnectionManager:
     a connection to the IBKR API, handling events, and managing connection state.
     """
     
-    def __init__(self, config: Optional[Config] = None):
+    # Wall-clock source for timestamps; tests swap in a fixed time
+    _now = staticmethod(datetime.now)
+    
+    def __init__(self, config: Optional[Config] = None, confirm_heartbeat: bool = False):
         """
         Initialize the connection manager.
         
         Args:
             config: Configuration object. If None, uses default config.
+            confirm_heartbeat: Default for ``connect(confirm_heartbeat=...)``,
+                including connections made by ``async with``
         """
         self.config = config or Config.from_env()
+        self.confirm_heartbeat = confirm_heartbeat
         self.config.validate()
         
         self.ib = IB()
@@ -54,6 +60,10 @@ class ConnectionManager:
         
         self._connected_time: Optional[datetime] = None
         self._reconnect_count = 0
+        
+        # Set once TWS answers a request after connecting (not just the handshake)
+        self.heartbeat_event = asyncio.Event()
+        self._heartbeat_task: Optional[asyncio.Task] = None
         self._setup_event_handlers()
     
     def _setup_event_handlers(self) -> None:
@@ -70,7 +80,8 @@ class ConnectionManager:
         self, 
         host: Optional[str] = None,
         port: Optional[int] = None,
-        client_id: Optional[int] = None
+        client_id: Optional[int] = None,
+        confirm_heartbeat: Optional[bool] = None
     ) -> None:
         """
         Establish connection to TWS/Gateway.
@@ -79,6 +90,9 @@ class ConnectionManager:
             host: Override config host
             port: Override config port
             client_id: Override config client_id
+            confirm_heartbeat: Also request the server time in the background
+                and set ``heartbeat_event`` once TWS answers (defaults to
+                the value given to the constructor)
             
         Raises:
             ConnectionError: If connection fails
@@ -108,8 +122,13 @@ class ConnectionManager:
             
             # Connection successful
             self.state = ConnectionState.CONNECTED
-            self._connected_time = datetime.now()
+            self._connected_time = self._now()
             self._reconnect_count = 0
+            self.heartbeat_event.clear()
+            if confirm_heartbeat is None:
+                confirm_heartbeat = self.confirm_heartbeat
+            if confirm_heartbeat:
+                self._heartbeat_task = asyncio.create_task(self._confirm_heartbeat())
             
             await self.event_manager.emit('connection_established', {
                 'host': host,
@@ -134,19 +153,40 @@ class ConnectionManager:
             return
         
         self.logger.info("Disconnecting from IBKR")
+        if self._heartbeat_task and not self._heartbeat_task.done():
+            self._heartbeat_task.cancel()
+        self.heartbeat_event.clear()
         self.ib.disconnect()
         self.state = ConnectionState.DISCONNECTED
         self._connected_time = None
         
         await self.event_manager.emit('connection_closed', {
-            'timestamp': datetime.now()
+            'timestamp': self._now()
         })
     
+    async def _confirm_heartbeat(self) -> None:
+        """Set heartbeat_event on the first successful server time reply."""
+        try:
+            await self.ib.reqCurrentTimeAsync()
+        except Exception as e:
+            self.logger.debug(f"Heartbeat request failed: {e}")
+            return
+        self.heartbeat_event.set()
+    
     async def ensure_connected(self) -> None:
         """Ensure connection is active, reconnect if necessary."""
         if self.state != ConnectionState.CONNECTED:
             await self.connect()
     
+    async def __aenter__(self) -> 'ConnectionManager':
+        """Connect on entering an ``async with`` block."""
+        await self.connect()
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        """Disconnect on leaving the block, including on error or cancellation."""
+        await self.disconnect()
+    
     def is_connected(self) -> bool:
         """Check if currently connected."""
         return self.state == ConnectionState.CONNECTED and self.ib.isConnected()
@@ -172,16 +212,17 @@ class ConnectionManager:
         """Handle disconnected event."""
         self.logger.warning("Disconnected event received")
         self.state = ConnectionState.DISCONNECTED
+        now = self._now()
         asyncio.create_task(self.event_manager.emit('connection_lost', {
-            'timestamp': datetime.now(),
+            'timestamp': now,
             'was_connected_for': (
-                datetime.now() - self._connected_time 
+                now - self._connected_time 
                 if self._connected_time else None
             )
         }))
     
     def _on_error(self, reqId: int, errorCode: int, errorString: str, 
-                  contract: Optional[Contract] = None) -> None:
+                  contract: Optional[Contract] = None) -> asyncio.Task:
         """
         Handle error events from TWS.
         
@@ -190,16 +231,19 @@ class ConnectionManager:
             errorCode: TWS error code
             errorString: Error description
             contract: Contract related to error (if any)
+            
+        Returns:
+            The task emitting 'error_occurred' (awaitable by callers that need it done)
         """
         self.logger.error(f"TWS Error {errorCode}: {errorString} (reqId={reqId})")
         
         # TODO: Windows testing - verify error handling with real TWS
-        asyncio.create_task(self.event_manager.emit('error_occurred', {
+        return asyncio.create_task(self.event_manager.emit('error_occurred', {
             'req_id': reqId,
             'error_code': errorCode,
             'error_string': errorString,
             'contract': contract,
-            'timestamp': datetime.now()
+            'timestamp': self._now()
         }))
     
     def __repr__(self) -> str:
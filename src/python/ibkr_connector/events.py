@@ -7,10 +7,16 @@ events throughout the IBKR connector system.
 
 import asyncio
 import logging
-from typing import Dict, List, Callable, Any, Optional
-from collections import defaultdict
+from typing import Dict, List, Callable, Any, Optional, Tuple
+from collections import defaultdict, deque
+from itertools import islice
 from datetime import datetime
 
+# Shared (sync, async) pair for events nobody listens to
+_EMPTY_PAIR: Tuple[tuple, tuple] = ((), ())
+
+_DEFAULT_HISTORY_LIMIT = 1000
+
 
 class EventManager:
     """
@@ -22,11 +28,22 @@ class EventManager:
     
     def __init__(self):
         """Initialize the event manager."""
-        self._handlers: Dict[str, List[Callable]] = defaultdict(list)
-        self._async_handlers: Dict[str, List[Callable]] = defaultdict(list)
+        # event name -> (sync handlers, async handlers); one lookup per emit
+        self._handlers: Dict[str, Tuple[List[Callable], List[Callable]]] = defaultdict(
+            lambda: ([], [])
+        )
         self.logger = logging.getLogger(__name__)
-        self._event_history: List[Dict[str, Any]] = []
-        self._history_limit = 1000
+        # Bounded history: appends past the limit drop the oldest entry in O(1)
+        self._event_history: deque = deque(maxlen=_DEFAULT_HISTORY_LIMIT)
+    
+    @property
+    def _history_limit(self) -> int:
+        """Maximum number of events kept in history."""
+        return self._event_history.maxlen
+    
+    @_history_limit.setter
+    def _history_limit(self, limit: int) -> None:
+        self._event_history = deque(self._event_history, maxlen=limit)
     
     def on(self, event_name: str, handler: Callable) -> None:
         """
@@ -36,11 +53,12 @@ class EventManager:
             event_name: Name of the event to listen for
             handler: Callable to invoke when event occurs
         """
+        sync_handlers, async_handlers = self._handlers[event_name]
         if asyncio.iscoroutinefunction(handler):
-            self._async_handlers[event_name].append(handler)
+            async_handlers.append(handler)
             self.logger.debug(f"Registered async handler for '{event_name}'")
         else:
-            self._handlers[event_name].append(handler)
+            sync_handlers.append(handler)
             self.logger.debug(f"Registered sync handler for '{event_name}'")
     
     def off(self, event_name: str, handler: Callable) -> None:
@@ -51,11 +69,12 @@ class EventManager:
             event_name: Name of the event
             handler: Handler to remove
         """
-        if handler in self._handlers[event_name]:
-            self._handlers[event_name].remove(handler)
+        sync_handlers, async_handlers = self._handlers[event_name]
+        if handler in sync_handlers:
+            sync_handlers.remove(handler)
             self.logger.debug(f"Removed sync handler for '{event_name}'")
-        elif handler in self._async_handlers[event_name]:
-            self._async_handlers[event_name].remove(handler)
+        elif handler in async_handlers:
+            async_handlers.remove(handler)
             self.logger.debug(f"Removed async handler for '{event_name}'")
     
     async def emit(self, event_name: str, data: Optional[Dict[str, Any]] = None) -> None:
@@ -75,8 +94,10 @@ class EventManager:
         
         self.logger.debug(f"Emitting event '{event_name}' with data: {data}")
         
+        sync_handlers, async_handlers = self._handlers.get(event_name, _EMPTY_PAIR)
+        
         # Call sync handlers
-        for handler in self._handlers[event_name]:
+        for handler in sync_handlers:
             try:
                 handler(data)
             except Exception as e:
@@ -87,7 +108,7 @@ class EventManager:
         
         # Call async handlers
         tasks = []
-        for handler in self._async_handlers[event_name]:
+        for handler in async_handlers:
             tasks.append(self._call_async_handler(handler, event_name, data))
         
         if tasks:
@@ -115,10 +136,6 @@ class EventManager:
             'data': data.copy(),
             'timestamp': datetime.now()
         })
-        
-        # Trim history if needed
-        if len(self._event_history) > self._history_limit:
-            self._event_history = self._event_history[-self._history_limit:]
     
     def get_history(
         self, 
@@ -141,14 +158,22 @@ class EventManager:
             history = [e for e in history if e['event'] == event_name]
         
         if limit:
-            history = history[-limit:]
+            # Walk back from the newest entry only as far as needed
+            return list(islice(reversed(history), limit))[::-1]
         
-        return history
+        return list(history)
     
     def clear_history(self) -> None:
         """Clear event history."""
         self._event_history.clear()
     
+    def reset(self) -> None:
+        """Remove all handlers and history and restore the default history limit."""
+        self._handlers.clear()
+        self._event_history.clear()
+        if self._history_limit != _DEFAULT_HISTORY_LIMIT:
+            self._history_limit = _DEFAULT_HISTORY_LIMIT
+    
     def handler_count(self, event_name: Optional[str] = None) -> Dict[str, int]:
         """
         Get count of registered handlers.
@@ -160,17 +185,13 @@ class EventManager:
             Dictionary of event names to handler counts
         """
         if event_name:
-            sync_count = len(self._handlers.get(event_name, []))
-            async_count = len(self._async_handlers.get(event_name, []))
-            return {event_name: sync_count + async_count}
-        
-        counts = {}
-        for name in set(self._handlers.keys()) | set(self._async_handlers.keys()):
-            sync_count = len(self._handlers.get(name, []))
-            async_count = len(self._async_handlers.get(name, []))
-            counts[name] = sync_count + async_count
+            sync_handlers, async_handlers = self._handlers.get(event_name, _EMPTY_PAIR)
+            return {event_name: len(sync_handlers) + len(async_handlers)}
         
-        return counts
+        return {
+            name: len(sync_handlers) + len(async_handlers)
+            for name, (sync_handlers, async_handlers) in self._handlers.items()
+        }
     
     def __repr__(self) -> str:
         """String representation of event manager."""
@@ -8,9 +8,10 @@ the TWS API rate limits (50 requests/second).
 import asyncio
 import time
 import logging
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Callable
 from dataclasses import dataclass
 from collections import deque
+from contextlib import asynccontextmanager
 from datetime import datetime, timedelta
 
 from ..config.settings import RateLimitConfig
@@ -39,25 +40,32 @@ class RateLimiter:
     - Performance statistics
     """
     
-    def __init__(self, config: Optional[RateLimitConfig] = None):
+    def __init__(
+        self,
+        config: Optional[RateLimitConfig] = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
         """
         Initialize the rate limiter.
         
         Args:
             config: Rate limit configuration
+            clock: Monotonic clock in seconds (injectable for tests)
         """
         self.config = config or RateLimitConfig()
         self.logger = logging.getLogger(__name__)
+        self._clock = clock
         
         # Token bucket state
         self._tokens = float(self.config.max_requests_per_second)
         self._max_tokens = float(self.config.max_requests_per_second)
         self._refill_rate = float(self.config.max_requests_per_second)
-        self._last_refill = time.monotonic()
+        self._last_refill = clock()
         
         # Request queue
         self._queue: deque = deque()
         self._lock = asyncio.Lock()
+        self._waiters = 0  # callers queued for the lock but not yet holding it
         
         # Statistics
         self.stats = RequestStats(last_reset=datetime.now())
@@ -81,43 +89,46 @@ class RateLimiter:
         Raises:
             RateLimitError: If timeout exceeded or rate limit cannot be satisfied
         """
-        start_time = time.monotonic()
+        start_time = self._clock()
         
-        async with self._lock:
-            # Refill tokens based on time elapsed
-            self._refill_tokens()
-            
-            # If we have tokens, consume one immediately
-            if self._tokens >= 1:
-                self._consume_token()
-                wait_time = 0.0
-            else:
-                # Calculate wait time needed
-                tokens_needed = 1 - self._tokens
-                wait_time = tokens_needed / self._refill_rate
-                
-                if timeout and wait_time > timeout:
-                    self.stats.rejected_requests += 1
-                    raise RateLimitError(
-                        f"Rate limit would require {wait_time:.2f}s wait, "
-                        f"exceeds timeout of {timeout}s",
-                        retry_after=wait_time
-                    )
-                
-                # Wait for tokens to be available
-                self.stats.queued_requests += 1
-                await asyncio.sleep(wait_time)
-                
-                # Refill and consume
+        # Fast path: nobody holds or is queued for the lock and a token is
+        # ready. Nothing awaits between the check and the take, so the lock
+        # can be skipped without overtaking an earlier caller.
+        if self._waiters or self._lock.locked() or not self._try_consume_token():
+            async with self._locked_in_turn():
+                # Refill tokens based on time elapsed
                 self._refill_tokens()
-                self._consume_token()
+                
+                # If we have tokens, consume one immediately
+                if self._tokens >= 1:
+                    self._consume_token()
+                else:
+                    # Calculate wait time needed
+                    tokens_needed = 1 - self._tokens
+                    wait_time = tokens_needed / self._refill_rate
+                    
+                    if timeout and wait_time > timeout:
+                        self.stats.rejected_requests += 1
+                        raise RateLimitError(
+                            f"Rate limit would require {wait_time:.2f}s wait, "
+                            f"exceeds timeout of {timeout}s",
+                            retry_after=wait_time
+                        )
+                    
+                    # Wait for tokens to be available
+                    self.stats.queued_requests += 1
+                    await asyncio.sleep(wait_time)
+                    
+                    # Refill and consume
+                    self._refill_tokens()
+                    self._consume_token()
         
         # Update statistics
         self.stats.total_requests += 1
-        self._request_times.append(time.monotonic())
+        self._request_times.append(self._clock())
         self._update_current_rate()
         
-        actual_wait = time.monotonic() - start_time
+        actual_wait = self._clock() - start_time
         self._update_average_wait_time(actual_wait)
         
         if actual_wait > 0.1:  # Log if we had to wait significantly
@@ -127,7 +138,7 @@ class RateLimiter:
     
     def _refill_tokens(self) -> None:
         """Refill tokens based on time elapsed."""
-        now = time.monotonic()
+        now = self._clock()
         elapsed = now - self._last_refill
         
         # Add tokens based on time elapsed
@@ -135,6 +146,27 @@ class RateLimiter:
         self._tokens = min(self._max_tokens, self._tokens + tokens_to_add)
         self._last_refill = now
     
+    @asynccontextmanager
+    async def _locked_in_turn(self):
+        """Hold the lock, counting the caller as a waiter until it gets it."""
+        self._waiters += 1
+        try:
+            await self._lock.acquire()
+        finally:
+            self._waiters -= 1
+        try:
+            yield
+        finally:
+            self._lock.release()
+    
+    def _try_consume_token(self) -> bool:
+        """Refill and take a token if one is available, without waiting."""
+        self._refill_tokens()
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return True
+        return False
+    
     def _consume_token(self) -> None:
         """Consume a token for a request."""
         self._tokens = max(0, self._tokens - 1)
@@ -146,7 +178,7 @@ class RateLimiter:
             return
         
         # Calculate rate over the last second
-        now = time.monotonic()
+        now = self._clock()
         one_second_ago = now - 1.0
         recent_requests = sum(1 for t in self._request_times if t > one_second_ago)
         self.stats.current_rate = float(recent_requests)
@@ -40,6 +40,8 @@ class ConnectionWatchdog:
     - Event-driven notifications
     """
     
+    MAX_RECONNECT_DELAY = 60  # seconds
+    
     def __init__(self, connection_manager: ConnectionManager):
         """
         Initialize watchdog.
@@ -54,12 +56,14 @@ class ConnectionWatchdog:
         self.state = WatchdogState.STOPPED
         self.monitoring_task: Optional[asyncio.Task] = None
         self.last_health_check = None
+        self._start_monotonic: Optional[float] = None
         
         # Configuration
         self.health_check_interval = 30  # seconds
-        self.reconnect_delay_base = 5    # seconds
-        self.max_reconnect_attempts = 10
+        self._reconnect_delay_base = 5   # seconds
+        self._max_reconnect_attempts = 10
         self.daily_restart_time = dt_time(23, 45)  # 11:45 PM
+        self._backoff_schedule = self._build_backoff_schedule()
         
         # Statistics
         self.stats = {
@@ -75,6 +79,33 @@ class ConnectionWatchdog:
         # Setup event handlers
         self._setup_event_handlers()
     
+    @property
+    def reconnect_delay_base(self) -> float:
+        """Base delay (seconds) for exponential reconnection backoff."""
+        return self._reconnect_delay_base
+    
+    @reconnect_delay_base.setter
+    def reconnect_delay_base(self, value: float) -> None:
+        self._reconnect_delay_base = value
+        self._backoff_schedule = self._build_backoff_schedule()
+    
+    @property
+    def max_reconnect_attempts(self) -> int:
+        """Maximum reconnection attempts before giving up."""
+        return self._max_reconnect_attempts
+    
+    @max_reconnect_attempts.setter
+    def max_reconnect_attempts(self, value: int) -> None:
+        self._max_reconnect_attempts = value
+        self._backoff_schedule = self._build_backoff_schedule()
+    
+    def _build_backoff_schedule(self) -> tuple:
+        """Precompute the capped exponential backoff delay for each attempt."""
+        return tuple(
+            min(self._reconnect_delay_base * (1 << i), self.MAX_RECONNECT_DELAY)
+            for i in range(self._max_reconnect_attempts)
+        )
+    
     def _setup_event_handlers(self) -> None:
         """Set up event handlers for connection events."""
         # Listen for connection events
@@ -85,18 +116,26 @@ class ConnectionWatchdog:
             'connection_established', self._on_connection_established
         )
     
-    async def start(self) -> None:
-        """Start watchdog monitoring."""
+    async def start(self, background: bool = True) -> None:
+        """
+        Start watchdog monitoring.
+        
+        Args:
+            background: Spawn the periodic monitoring task. Pass False to
+                drive checks manually with run_once().
+        """
         if self.state != WatchdogState.STOPPED:
             logger.warning("Watchdog already running")
             return
         
         logger.info("🐕 Starting Connection Watchdog")
         self.state = WatchdogState.MONITORING
-        self.stats['start_time'] = datetime.now()
+        self.stats['start_time'] = datetime.now()  # display only
+        self._start_monotonic = time.monotonic()
         
         # Start monitoring task
-        self.monitoring_task = asyncio.create_task(self._monitoring_loop())
+        if background:
+            self.monitoring_task = asyncio.create_task(self._monitoring_loop())
         
         await self.event_manager.emit('watchdog_started', {
             'timestamp': datetime.now(),
@@ -135,8 +174,7 @@ class ConnectionWatchdog:
         
         try:
             while self.state != WatchdogState.STOPPED:
-                await self._perform_health_check()
-                await self._check_daily_restart()
+                await self.run_once()
                 await asyncio.sleep(self.health_check_interval)
                 
         except asyncio.CancelledError:
@@ -149,6 +187,11 @@ class ConnectionWatchdog:
                 'timestamp': datetime.now()
             })
     
+    async def run_once(self) -> None:
+        """Run a single monitoring iteration (health check + restart check)."""
+        await self._perform_health_check()
+        await self._check_daily_restart()
+    
     async def _perform_health_check(self) -> None:
         """Perform connection health check."""
         self.stats['health_checks'] += 1
@@ -185,20 +228,27 @@ class ConnectionWatchdog:
     
     async def _check_socket_health(self) -> bool:
         """Check if TWS socket is responsive."""
+        config = self.connection_manager.config.connection
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        
         try:
-            # Quick socket connectivity test
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.settimeout(3)
-            
-            config = self.connection_manager.config.connection
-            result = sock.connect_ex((config.host, config.port))
-            sock.close()
+            # Non-blocking connect; the loop waits instead of the thread
+            sock.setblocking(False)
+            if hasattr(socket, 'TCP_USER_TIMEOUT'):
+                # Let the kernel abort a stalled handshake (Linux only)
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_USER_TIMEOUT, 3000)
             
-            return result == 0
+            loop = asyncio.get_running_loop()
+            await asyncio.wait_for(
+                loop.sock_connect(sock, (config.host, config.port)), timeout=3
+            )
+            return True
             
         except Exception as e:
             logger.debug(f"Socket health check failed: {e}")
             return False
+        finally:
+            sock.close()
     
     async def _check_daily_restart(self) -> None:
         """Check if we're approaching daily TWS restart time."""
@@ -266,9 +316,8 @@ class ConnectionWatchdog:
                 if self.connection_manager.is_connected():
                     await self.connection_manager.disconnect()
                 
-                # Wait with exponential backoff
-                delay = self.reconnect_delay_base * (2 ** (attempt - 1))
-                await asyncio.sleep(min(delay, 60))  # Max 60 seconds
+                # Wait with exponential backoff (capped at MAX_RECONNECT_DELAY)
+                await asyncio.sleep(self._backoff_schedule[attempt - 1])
                 
                 # Attempt reconnection
                 await self.connection_manager.connect()
@@ -322,8 +371,8 @@ class ConnectionWatchdog:
     
     def get_uptime(self) -> float:
         """Get watchdog uptime in seconds."""
-        if self.stats['start_time']:
-            return (datetime.now() - self.stats['start_time']).total_seconds()
+        if self._start_monotonic is not None:
+            return time.monotonic() - self._start_monotonic
         return 0
     
     def get_health_status(self) -> Dict[str, Any]:
@@ -333,7 +382,7 @@ class ConnectionWatchdog:
             'connection_state': self.connection_manager.state.value,
             'uptime_seconds': self.get_uptime(),
             'last_health_check': self.last_health_check,
-            'stats': self.stats.copy(),
+            'stats': self.stats.copy(),  # snapshot; safe to keep or serialize
             'config': {
                 'health_check_interval': self.health_check_interval,
                 'max_reconnect_attempts': self.max_reconnect_attempts,
@@ -6,6 +6,7 @@ the scanner service and maintain system stability.
 """
 
 import asyncio
+import time
 from typing import Dict, Optional, Callable, Any
 from datetime import datetime, timedelta
 from collections import deque
@@ -51,18 +52,20 @@ class BackpressureHandler:
         burst_size: int = 20,
         queue_size: int = 100,
         circuit_breaker_threshold: int = 5,
-        circuit_breaker_timeout: int = 60
+        circuit_breaker_timeout: int = 60,
+        clock: Callable[[], float] = time.monotonic
     ):
         self.strategy = strategy
         self.requests_per_second = requests_per_second
         self.burst_size = burst_size
         self.queue_size = queue_size
+        self._clock = clock  # seconds; injectable so tests can advance time
         
         # Circuit breaker
         self.circuit_breaker_threshold = circuit_breaker_threshold
         self.circuit_breaker_timeout = circuit_breaker_timeout
         self.circuit_breaker_failures = 0
-        self.circuit_breaker_opened_at: Optional[datetime] = None
+        self.circuit_breaker_opened_at: Optional[float] = None  # clock() reading
         
         # Request queue
         self.request_queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
@@ -70,7 +73,7 @@ class BackpressureHandler:
         
         # Rate limiting
         self.tokens = float(burst_size)
-        self.last_refill = datetime.now()
+        self.last_refill = clock()
         
         # Metrics
         self.request_history: deque = deque(maxlen=1000)
@@ -106,16 +109,51 @@ class BackpressureHandler:
         else:
             return await self._fixed_window_acquire()
             
-    async def _token_bucket_acquire(self) -> bool:
-        """Token bucket rate limiting"""
-        now = datetime.now()
+    async def acquire_many(self, n: int) -> bool:
+        """
+        Acquire permission for a batch of n requests at once
         
-        # Refill tokens
-        time_passed = (now - self.last_refill).total_seconds()
+        Tokens are drawn from the token bucket in a single step; either all
+        n are granted or none are (no partial deduction, no waiting). Only
+        the token bucket strategy supports batches.
+        
+        Args:
+            n: Number of requests in the batch
+            
+        Returns:
+            True if the whole batch can proceed, False if rejected
+            
+        Raises:
+            ValueError: If the handler is not using the token bucket strategy
+        """
+        if self.strategy != BackpressureStrategy.TOKEN_BUCKET:
+            raise ValueError(
+                f"acquire_many requires the token_bucket strategy, not {self.strategy.value}"
+            )
+            
+        if self._is_circuit_open():
+            logger.warning("Circuit breaker is open, rejecting batch")
+            return False
+            
+        self._refill_tokens()
+        if self.tokens >= n:
+            self.tokens -= n
+            return True
+        return False
+        
+    def _refill_tokens(self):
+        """Add tokens accrued since the last refill, capped at burst size"""
+        now = self._clock()
+        time_passed = now - self.last_refill
         tokens_to_add = time_passed * self.requests_per_second
         self.tokens = min(self.burst_size, self.tokens + tokens_to_add)
         self.last_refill = now
         
+    async def _token_bucket_acquire(self) -> bool:
+        """Token bucket rate limiting"""
+        # Refill tokens
+        self._refill_tokens()
+        
         # Try to acquire token
         if self.tokens >= 1:
             self.tokens -= 1
@@ -220,18 +258,18 @@ class BackpressureHandler:
         
     def _open_circuit_breaker(self):
         """Open the circuit breaker"""
-        self.circuit_breaker_opened_at = datetime.now()
+        self.circuit_breaker_opened_at = self._clock()
         logger.warning(
             f"Circuit breaker opened after {self.circuit_breaker_failures} failures"
         )
         
     def _is_circuit_open(self) -> bool:
         """Check if circuit breaker is open"""
-        if not self.circuit_breaker_opened_at:
+        if self.circuit_breaker_opened_at is None:
             return False
             
         # Check if timeout has passed
-        time_open = (datetime.now() - self.circuit_breaker_opened_at).total_seconds()
+        time_open = self._clock() - self.circuit_breaker_opened_at
         if time_open > self.circuit_breaker_timeout:
             # Reset circuit breaker
             self.circuit_breaker_opened_at = None
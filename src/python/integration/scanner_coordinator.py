@@ -6,7 +6,7 @@ and back to trading execution.
 """
 
 import asyncio
-from typing import Dict, List, Optional, Set
+from typing import Callable, Dict, List, Optional, Set
 from datetime import datetime, timedelta
 import logging
 from dataclasses import dataclass
@@ -86,6 +86,9 @@ class ScannerCoordinator:
         self._tasks: Set[asyncio.Task] = set()
         self._running = False
         
+        # Optional hook called with the job after every status change
+        self.on_state_change: Optional[Callable[[ScanJob], None]] = None
+        
     async def start(self):
         """Start the coordinator"""
         self._running = True
@@ -159,6 +162,8 @@ class ScannerCoordinator:
             created_at=datetime.now()
         )
         
+        if self.on_state_change:
+            self.on_state_change(job)  # pending
         await self.job_queue.put(job)
         self.active_jobs[job.id] = job
         
@@ -209,7 +214,7 @@ class ScannerCoordinator:
         
         try:
             logger.info(f"Processing scan job {job.id} for {job.symbol}")
-            job.status = "processing"
+            self._set_status(job, "processing")
             
             # Step 1: Fetch option chain data from IBKR
             option_data = await self._fetch_option_chain(job.symbol)
@@ -230,8 +235,8 @@ class ScannerCoordinator:
             )
             
             # Update job
-            job.status = "completed"
             job.result = spreads
+            self._set_status(job, "completed")
             
             # Update metrics
             self.metrics["total_scans"] += 1
@@ -257,8 +262,8 @@ class ScannerCoordinator:
             
         except Exception as e:
             logger.error(f"Scan job {job.id} failed: {e}")
-            job.status = "failed"
             job.error = str(e)
+            self._set_status(job, "failed")
             self.metrics["failed_scans"] += 1
             
             # Record backpressure failure
@@ -315,10 +320,16 @@ class ScannerCoordinator:
             except Exception as e:
                 logger.error(f"Cache cleanup error: {e}")
                 
+    def _set_status(self, job: ScanJob, status: str):
+        """Update a job's status and notify the state-change hook"""
+        job.status = status
+        if self.on_state_change:
+            self.on_state_change(job)
+            
     def _get_cache_key(self, symbol: str, filters: List[ScanFilter]) -> str:
         """Generate cache key from symbol and filters"""
         filter_str = "_".join(
-            f"{f.type.value}_{hash(str(f.params))}" 
+            f"{f.type.value}_{hash(str(dict(f.params)))}" 
             for f in sorted(filters, key=lambda x: x.type.value)
         )
         return f"{symbol}_{filter_str}"
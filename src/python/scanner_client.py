@@ -7,15 +7,20 @@ It handles request/response serialization, retries, and error handling.
 
 import asyncio
 import json
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Mapping, Optional, Any, Tuple
+from functools import lru_cache
+from types import MappingProxyType
 from datetime import datetime
 import httpx
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, field
 import logging
 from enum import Enum
 
 logger = logging.getLogger(__name__)
 
+# Pool sizing for the scanner service; keepalive connections are reused across scans
+DEFAULT_POOL_LIMITS = httpx.Limits(max_keepalive_connections=20, max_connections=50)
+
 
 class FilterType(str, Enum):
     """Filter types supported by the scanner"""
@@ -30,11 +35,19 @@ class FilterType(str, Enum):
     PROBABILITY_PROFIT = "probability_profit"
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ScanFilter:
     """Individual scan filter configuration"""
     type: FilterType
-    params: Dict[str, Any]
+    # Mappings are unhashable, so params take part in equality but not the hash;
+    # read-only mappings (e.g. MappingProxyType) are accepted
+    params: Mapping[str, Any] = field(hash=False)
+    
+    @classmethod
+    @lru_cache(maxsize=256)
+    def cached(cls, type_: FilterType, params_items: Tuple[Tuple[str, Any], ...]) -> 'ScanFilter':
+        """Shared instance for a common filter; params are read-only"""
+        return cls(type=type_, params=MappingProxyType(dict(params_items)))
 
 
 @dataclass
@@ -49,7 +62,7 @@ class ScanRequest:
         """Convert to dictionary for JSON serialization"""
         return {
             "symbol": self.symbol,
-            "filters": [{"type": f.type.value, "params": f.params} for f in self.filters],
+            "filters": [{"type": f.type.value, "params": dict(f.params)} for f in self.filters],
             "limit": self.limit,
             "sort_by": self.sort_by
         }
@@ -107,19 +120,29 @@ class ScannerClient:
         self,
         base_url: str = "http://localhost:8080",
         timeout: float = 30.0,
-        max_retries: int = 3
+        max_retries: int = 3,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        limits: httpx.Limits = DEFAULT_POOL_LIMITS
     ):
         self.base_url = base_url
         self.timeout = timeout
         self.max_retries = max_retries
+        self.transport = transport  # e.g. httpx.MockTransport in tests
+        self.limits = limits
         self._client: Optional[httpx.AsyncClient] = None
         
-    async def __aenter__(self):
-        """Async context manager entry"""
-        self._client = httpx.AsyncClient(
+    def _build_client(self) -> httpx.AsyncClient:
+        """Create the pooled HTTP client"""
+        return httpx.AsyncClient(
             base_url=self.base_url,
-            timeout=self.timeout
+            timeout=self.timeout,
+            transport=self.transport,
+            limits=self.limits
         )
+        
+    async def __aenter__(self):
+        """Async context manager entry"""
+        self._client = self._build_client()
         return self
         
     async def __aexit__(self, exc_type, exc_val, exc_tb):
@@ -130,10 +153,7 @@ class ScannerClient:
     async def _ensure_client(self):
         """Ensure HTTP client is initialized"""
         if not self._client:
-            self._client = httpx.AsyncClient(
-                base_url=self.base_url,
-                timeout=self.timeout
-            )
+            self._client = self._build_client()
             
     async def health_check(self) -> Dict[str, Any]:
         """Check scanner service health"""
@@ -8,20 +8,35 @@ import socket
 import time
 import logging
 from datetime import datetime
-from enum import Enum
-from typing import Dict, Any
+from array import array
+from enum import IntEnum
+from typing import Dict, Any, List, Optional, Tuple
+
+try:
+    import uvloop
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
-class WatchdogState(Enum):
-    """Watchdog states."""
-    STOPPED = "stopped"
-    MONITORING = "monitoring"
-    RECONNECTING = "reconnecting"
-    ERROR = "error"
+class WatchdogState(IntEnum):
+    """Watchdog states (int-backed for cheap comparisons in the loop)."""
+    STOPPED = 0
+    MONITORING = 1
+    RECONNECTING = 2
+    ERROR = 3
+    
+    def __str__(self) -> str:
+        return self.name.lower()
+
+
+# Counter slots in SimpleWatchdog._counters
+HEALTH_CHECKS, FAILED_CHECKS, RECONNECT_ATTEMPTS = range(3)
+_COUNTER_NAMES = ('health_checks', 'failed_checks', 'reconnect_attempts')
 
 
 class SimpleWatchdog:
@@ -30,18 +45,60 @@ class SimpleWatchdog:
     Uses socket-based health checks since we confirmed TWS connectivity.
     """
     
-    def __init__(self, host="127.0.0.1", port=7497):
+    def __init__(self, host="127.0.0.1", port=7497,
+                 extra_endpoints: Optional[List[Tuple[str, int]]] = None):
+        self._config_snapshot: Optional[Dict[str, Any]] = None
         self.host = host
         self.port = port
+        self.extra_endpoints = extra_endpoints or ()  # e.g. a backup gateway
+        self._sockaddrs: Dict[Tuple[str, int], Tuple[int, Tuple]] = {}
         self.state = WatchdogState.STOPPED
         self.monitoring_task = None
+        self._stop_event: Optional[asyncio.Event] = None
         self.health_check_interval = 5  # seconds
-        self.stats = {
-            'start_time': None,
-            'health_checks': 0,
-            'failed_checks': 0,
-            'reconnect_attempts': 0
-        }
+        self.probe_timeout = 3.0         # seconds
+        self.reconnect_delay = 2         # seconds
+        self._start_monotonic: Optional[float] = None
+        self.last_health_check: Optional[float] = None  # monotonic seconds
+        self._start_time: Optional[datetime] = None  # display only
+        self._counters = array('Q', [0] * len(_COUNTER_NAMES))
+    
+    # Config setters invalidate the cached status snapshot
+    @property
+    def host(self) -> str:
+        return self._host
+    
+    @host.setter
+    def host(self, value: str):
+        self._host = value
+        self._config_snapshot = None
+    
+    @property
+    def port(self) -> int:
+        return self._port
+    
+    @port.setter
+    def port(self, value: int):
+        self._port = value
+        self._config_snapshot = None
+    
+    @property
+    def extra_endpoints(self) -> Tuple[Tuple[str, int], ...]:
+        return self._extra_endpoints
+    
+    @extra_endpoints.setter
+    def extra_endpoints(self, value):
+        self._extra_endpoints = tuple(value)
+        self._config_snapshot = None
+    
+    @property
+    def health_check_interval(self) -> float:
+        return self._health_check_interval
+    
+    @health_check_interval.setter
+    def health_check_interval(self, value: float):
+        self._health_check_interval = value
+        self._config_snapshot = None
     
     async def start(self):
         """Start watchdog monitoring."""
@@ -51,65 +108,142 @@ class SimpleWatchdog:
         
         logger.info("🐕 Starting Simple Watchdog")
         self.state = WatchdogState.MONITORING
-        self.stats['start_time'] = datetime.now()
+        self._start_time = datetime.now()
+        self._start_monotonic = time.monotonic()
+        self._stop_event = asyncio.Event()
+        
+        # Resolve endpoints once so probes skip getaddrinfo
+        await asyncio.gather(
+            *(self._resolve(host, port) for host, port in self.endpoints),
+            return_exceptions=True
+        )
         
         # Start monitoring task
         self.monitoring_task = asyncio.create_task(self._monitoring_loop())
     
     async def stop(self):
         """Stop watchdog monitoring."""
-        if self.state == WatchdogState.STOPPED:
+        if self.state == WatchdogState.STOPPED or self._stop_event.is_set():
             return
         
         logger.info("🛑 Stopping Simple Watchdog")
-        self.state = WatchdogState.STOPPED
+        self._stop_event.set()
         
         if self.monitoring_task:
-            self.monitoring_task.cancel()
+            # Wake the loop; cancel only if an in-flight probe overruns
             try:
-                await self.monitoring_task
-            except asyncio.CancelledError:
+                await asyncio.wait_for(self.monitoring_task, timeout=1.0)
+            except asyncio.TimeoutError:
                 pass
+            except asyncio.CancelledError:
+                # Only the worker's own cancellation is expected; never swallow ours
+                if asyncio.current_task().cancelling():
+                    raise
+        
+        # Last, so an in-flight reconnect cannot overwrite it
+        self.state = WatchdogState.STOPPED
     
     async def _monitoring_loop(self):
         """Main monitoring loop."""
         logger.info("🔍 Watchdog monitoring started")
         
         try:
-            while self.state != WatchdogState.STOPPED:
-                await self._perform_health_check()
-                await asyncio.sleep(self.health_check_interval)
+            while not self._stop_event.is_set():
+                # One clock read per iteration, shared with the health check
+                await self._perform_health_check(time.monotonic())
+                try:
+                    # Sleep until the next check, waking early on stop()
+                    await asyncio.wait_for(
+                        self._stop_event.wait(), timeout=self.health_check_interval
+                    )
+                except asyncio.TimeoutError:
+                    pass
         except asyncio.CancelledError:
             logger.info("Monitoring loop cancelled")
         except Exception as e:
             logger.error(f"Monitoring error: {e}")
             self.state = WatchdogState.ERROR
     
-    async def _perform_health_check(self):
-        """Perform socket-based health check."""
-        self.stats['health_checks'] += 1
+    async def _perform_health_check(self, now: Optional[float] = None):
+        """Perform socket-based health check.
+        
+        Args:
+            now: Monotonic timestamp of the current monitoring iteration
+        """
+        if now is None:
+            now = time.monotonic()
+        self._counters[HEALTH_CHECKS] += 1
+        self.last_health_check = now
         
         try:
-            # Quick socket test
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.settimeout(3)
-            result = sock.connect_ex((self.host, self.port))
-            sock.close()
+            # Quick non-blocking socket test
+            healthy = await self._probe_tws()
+            
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Health check #%d probe took %.1f ms",
+                             self._counters[HEALTH_CHECKS], (time.monotonic() - now) * 1000)
             
-            if result == 0:
-                logger.info(f"✅ Health check #{self.stats['health_checks']}: TWS responsive")
+            if healthy:
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info("✅ Health check #%d: TWS responsive", self._counters[HEALTH_CHECKS])
                 return True
             else:
-                logger.warning(f"⚠️ Health check #{self.stats['health_checks']}: TWS not responsive")
-                self.stats['failed_checks'] += 1
+                logger.warning("⚠️ Health check #%d: TWS not responsive", self._counters[HEALTH_CHECKS])
+                self._counters[FAILED_CHECKS] += 1
                 await self._handle_connection_issue()
                 return False
                 
         except Exception as e:
             logger.error(f"Health check error: {e}")
-            self.stats['failed_checks'] += 1
+            self._counters[FAILED_CHECKS] += 1
             return False
     
+    @property
+    def endpoints(self) -> List[Tuple[str, int]]:
+        """All endpoints probed per health check, primary TWS first."""
+        return [(self.host, self.port), *self.extra_endpoints]
+    
+    async def _probe_tws(self) -> bool:
+        """Probe every endpoint concurrently; healthy only if all respond."""
+        results = await asyncio.gather(
+            *(self._probe_endpoint(host, port) for host, port in self.endpoints)
+        )
+        return all(results)
+    
+    async def _probe_endpoint(self, host: str, port: int) -> bool:
+        """Probe an endpoint with a fresh TCP connect, closed straight away.
+        
+        A held-open connection cannot tell a hung or half-open TWS from a
+        healthy one, and it would sit idle on the API port between checks.
+        """
+        sock = None
+        try:
+            family, sockaddr = await self._resolve(host, port)
+            sock = socket.socket(family, socket.SOCK_STREAM)
+            sock.setblocking(False)
+            
+            loop = asyncio.get_running_loop()
+            await asyncio.wait_for(loop.sock_connect(sock, sockaddr), timeout=self.probe_timeout)
+            return True
+        except (asyncio.TimeoutError, OSError):
+            return False
+        finally:
+            if sock is not None:
+                sock.close()
+    
+    async def _resolve(self, host: str, port: int) -> Tuple[int, Tuple]:
+        """Return (family, sockaddr) for an endpoint, resolving only once."""
+        key = (host, port)
+        resolved = self._sockaddrs.get(key)
+        
+        if resolved is None:
+            loop = asyncio.get_running_loop()
+            infos = await loop.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+            family, _, _, _, sockaddr = infos[0]
+            resolved = self._sockaddrs[key] = (family, sockaddr)
+        
+        return resolved
+    
     async def _handle_connection_issue(self):
         """Handle connection issues."""
         if self.state == WatchdogState.RECONNECTING:
@@ -117,39 +251,51 @@ class SimpleWatchdog:
         
         logger.info("🔄 Handling connection issue")
         self.state = WatchdogState.RECONNECTING
-        self.stats['reconnect_attempts'] += 1
+        self._counters[RECONNECT_ATTEMPTS] += 1
         
         # Simulate reconnection logic
-        await asyncio.sleep(2)
+        await asyncio.sleep(self.reconnect_delay)
         
         # Check if connection is restored
-        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        sock.settimeout(3)
-        result = sock.connect_ex((self.host, self.port))
-        sock.close()
+        healthy = await self._probe_tws()
+        if self._stop_event.is_set():
+            return
         
-        if result == 0:
+        if healthy:
             logger.info("✅ Connection restored")
             self.state = WatchdogState.MONITORING
         else:
             logger.warning("❌ Connection still down")
             self.state = WatchdogState.ERROR
     
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """Counter snapshot, built on read so increments stay C-level."""
+        stats = dict(zip(_COUNTER_NAMES, self._counters))
+        stats['start_time'] = self._start_time
+        return stats
+    
     def get_status(self) -> Dict[str, Any]:
         """Get watchdog status."""
         uptime = 0
-        if self.stats['start_time']:
-            uptime = (datetime.now() - self.stats['start_time']).total_seconds()
+        if self._start_monotonic is not None:
+            uptime = time.monotonic() - self._start_monotonic
         
-        return {
-            'state': self.state.value,
-            'uptime_seconds': uptime,
-            'stats': self.stats.copy(),
-            'config': {
+        if self._config_snapshot is None:
+            self._config_snapshot = {
                 'host': self.host,
                 'port': self.port,
+                'extra_endpoints': list(self.extra_endpoints),
                 'health_check_interval': self.health_check_interval
             }
+        
+        return {
+            'state': str(self.state),
+            'uptime_seconds': uptime,
+            'stats': self.stats,
+            # Copies, so callers cannot mutate the cached snapshot
+            'config': {**self._config_snapshot,
+                       'extra_endpoints': list(self._config_snapshot['extra_endpoints'])}
         }
 
 
@@ -200,6 +346,11 @@ async def test_connection_recovery():
     
     watchdog = SimpleWatchdog()
     
+    # Sub-second timings; the recovery logic is the same as at 5 s
+    watchdog.health_check_interval = 0.1
+    watchdog.probe_timeout = 0.5
+    watchdog.reconnect_delay = 0.1
+    
     try:
         await watchdog.start()
         
@@ -209,14 +360,14 @@ async def test_connection_recovery():
         watchdog.port = 9999  # Invalid port
         
         # Wait for health check to detect issue
-        await asyncio.sleep(6)
+        await asyncio.sleep(0.3)
         
         # Restore correct port
         watchdog.port = original_port
         logger.info("📋 Restoring connection...")
         
         # Wait for recovery
-        await asyncio.sleep(6)
+        await asyncio.sleep(0.3)
         
         # Check final status
         status = watchdog.get_status()
@@ -233,6 +384,48 @@ async def test_connection_recovery():
             await watchdog.stop()
 
 
+async def test_stop_cancellation():
+    """Test that cancelling a caller blocked in stop() is not swallowed."""
+    logger.info("🧪 Testing Stop Cancellation")
+    
+    watchdog = SimpleWatchdog()
+    probe_released = asyncio.Event()
+    
+    async def stalled_probe():
+        # Hold the monitoring loop inside a health check until released
+        await probe_released.wait()
+        return True
+    
+    watchdog._probe_tws = stalled_probe
+    
+    try:
+        await watchdog.start()
+        await asyncio.sleep(0.05)
+        
+        # stop() now waits on the stalled loop; cancel it before its 1 s grace period
+        stopper = asyncio.create_task(watchdog.stop())
+        await asyncio.sleep(0.05)
+        stopper.cancel()
+        try:
+            await stopper
+            logger.error("❌ stop() swallowed the caller's cancellation")
+            return False
+        except asyncio.CancelledError:
+            logger.info("✅ Caller cancellation propagated out of stop()")
+        
+        probe_released.set()
+        return True
+        
+    except Exception as e:
+        logger.error(f"Stop cancellation test failed: {e}")
+        return False
+    finally:
+        probe_released.set()
+        if watchdog.monitoring_task:
+            watchdog.monitoring_task.cancel()
+            await asyncio.gather(watchdog.monitoring_task, return_exceptions=True)
+
+
 async def run_phase1b_tests():
     """Run all Phase 1B tests."""
     logger.info("🚀 PHASE 1B: WATCHDOG TESTING")
@@ -240,13 +433,15 @@ async def run_phase1b_tests():
     
     results = {}
     
-    # Test 1: Basic functionality
+    # Suites use independent watchdogs, so run them concurrently
     logger.info("\n🔬 Test Suite 1: Basic Functionality")
-    results['basic'] = await test_watchdog_functionality()
-    
-    # Test 2: Connection recovery
-    logger.info("\n🔬 Test Suite 2: Connection Recovery")
-    results['recovery'] = await test_connection_recovery()
+    logger.info("🔬 Test Suite 2: Connection Recovery")
+    logger.info("🔬 Test Suite 3: Stop Cancellation")
+    results['basic'], results['recovery'], results['stop_cancel'] = await asyncio.gather(
+        test_watchdog_functionality(),
+        test_connection_recovery(),
+        test_stop_cancellation()
+    )
     
     # Summary
     logger.info("\n" + "=" * 50)
@@ -276,8 +471,10 @@ async def run_phase1b_tests():
 
 
 if __name__ == "__main__":
-    # Run Phase 1B tests
-    success = asyncio.run(run_phase1b_tests())
+    # Run Phase 1B tests; uvloop lowers scheduling overhead on the health loop
+    loop_factory = uvloop.new_event_loop if UVLOOP_AVAILABLE else None
+    with asyncio.Runner(loop_factory=loop_factory) as runner:
+        success = runner.run(run_phase1b_tests())
     
     if success:
         print("\n🎯 PHASE 1B STATUS: COMPLETE ✅")
@@ -5,10 +5,14 @@ Tests the complete integration between the Python IBKR service and Go scanner.
 """
 
 import asyncio
+import itertools
+import json
 import pytest
+import pytest_asyncio
 import httpx
 from datetime import datetime
-from unittest.mock import Mock, AsyncMock, patch
+from types import MappingProxyType
+from typing import Optional
 
 from src.python.scanner_client import (
     ScannerClient, ScanRequest, ScanFilter, FilterType,
@@ -21,132 +25,130 @@ from src.python.integration.backpressure import (
     BackpressureHandler, BackpressureStrategy
 )
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+JSON_HEADERS = {"content-type": "application/json"}
+SCANNER_URL = "http://localhost:8080"
+
+# Canonical filter sets, built once; params are read-only
+DELTA_25_35 = (ScanFilter.cached(FilterType.DELTA, (("min", 0.25), ("max", 0.35))),)
+DELTA_30_40 = (ScanFilter.cached(FilterType.DELTA, (("min", 0.3), ("max", 0.4))),)
+DELTA_20_40 = (ScanFilter.cached(FilterType.DELTA, (("min", 0.2), ("max", 0.4))),)
+DTE_30_90 = (ScanFilter.cached(FilterType.DTE, (("min", 30), ("max", 90))),)
+LIQ_FILTERS = (
+    ScanFilter.cached(
+        FilterType.LIQUIDITY,
+        (
+            ("min_volume", 100),
+            ("min_open_interest", 500),
+            ("max_bid_ask_spread", 0.15)
+        )
+    ),
+)
+
+
+# Test doubles: only the attributes ScannerCoordinator actually touches
+class _StubIBKR:
+    """IBKR connection stand-in that swallows emitted events"""
+    
+    async def emit_event(self, *args, **kwargs):
+        pass
+
+
+class _StubScanner:
+    """Scanner stand-in returning a fixed result and counting calls"""
+    
+    def __init__(self, result=(), release: Optional[asyncio.Event] = None):
+        self.calls = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.entered = asyncio.Condition()  # notified as each held scan starts
+        self._result = result
+        self._release = release  # when set, each scan waits for this event
+        
+    async def scan(self, *args, **kwargs):
+        self.calls += 1
+        if self._release is not None:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            async with self.entered:
+                self.entered.notify_all()
+            try:
+                await self._release.wait()
+            finally:
+                self.in_flight -= 1
+        return list(self._result)
+
 
 class TestScannerClient:
     """Test the scanner HTTP client"""
     
-    @pytest.mark.asyncio
-    async def test_health_check(self):
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_health_check(self, scanner_client, scanner_routes):
         """Test health check endpoint"""
-        async with ScannerClient(base_url="http://localhost:8080") as client:
-            # Mock the HTTP response
-            with patch.object(client._client, 'get') as mock_get:
-                mock_response = Mock()
-                mock_response.json.return_value = {"status": "healthy", "version": "1.0"}
-                mock_response.raise_for_status = Mock()
-                mock_get.return_value = mock_response
-                
-                health = await client.health_check()
-                
-                assert health["status"] == "healthy"
-                mock_get.assert_called_once_with("/health")
-                
-    @pytest.mark.asyncio
-    async def test_scan_request(self):
-        """Test basic scan request"""
-        async with ScannerClient() as client:
-            # Create scan request
-            request = ScanRequest(
-                symbol="AAPL",
-                filters=[
-                    ScanFilter(
-                        type=FilterType.DELTA,
-                        params={"min": 0.25, "max": 0.35}
-                    )
-                ],
-                limit=10
-            )
-            
-            # Mock response data
-            mock_spread_data = {
-                "long_leg": {
-                    "symbol": "AAPL",
-                    "expiry": "2025-02-21",
-                    "strike": 150.0,
-                    "right": "C",
-                    "delta": 0.30,
-                    "theta": -0.05,
-                    "vega": 0.15,
-                    "iv": 0.25,
-                    "volume": 1000,
-                    "open_interest": 5000,
-                    "bid": 5.50,
-                    "ask": 5.60,
-                    "last": 5.55
-                },
-                "short_leg": {
-                    "symbol": "AAPL",
-                    "expiry": "2025-02-21",
-                    "strike": 155.0,
-                    "right": "C",
-                    "delta": 0.20,
-                    "theta": -0.04,
-                    "vega": 0.12,
-                    "iv": 0.24,
-                    "volume": 800,
-                    "open_interest": 4000,
-                    "bid": 3.20,
-                    "ask": 3.30,
-                    "last": 3.25
-                },
-                "net_debit": 2.30,
-                "max_profit": 2.70,
-                "max_loss": 2.30,
-                "breakeven": 152.30,
-                "probability_profit": 0.65,
-                "score": 85.5
-            }
+        requested = []
+        
+        def handler(request: httpx.Request) -> httpx.Response:
+            requested.append(request.url.path)
+            return httpx.Response(200, json={"status": "healthy", "version": "1.0"})
             
-            # Mock the HTTP response
-            with patch.object(client._client, 'post') as mock_post:
-                mock_response = Mock()
-                mock_response.json.return_value = {"spreads": [mock_spread_data]}
-                mock_response.raise_for_status = Mock()
-                mock_post.return_value = mock_response
-                
-                spreads = await client.scan(request)
+        scanner_routes.handler = handler
+        health = await scanner_client.health_check()
+        
+        assert health["status"] == "healthy"
+        assert requested == ["/health"]
                 
-                assert len(spreads) == 1
-                spread = spreads[0]
-                assert spread.score == 85.5
-                assert spread.probability_profit == 0.65
-                assert spread.long_leg.strike == 150.0
-                assert spread.short_leg.strike == 155.0
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_scan_request(self, scanner_client, scanner_routes, canned_spread_body):
+        """Test basic scan request"""
+        scanner_routes.handler = lambda request: httpx.Response(
+            200, content=canned_spread_body, headers=JSON_HEADERS
+        )
+        
+        # Create scan request
+        request = ScanRequest(
+            symbol="AAPL",
+            filters=[*DELTA_25_35],
+            limit=10
+        )
+        
+        spreads = await scanner_client.scan(request)
+        
+        assert len(spreads) == 1
+        spread = spreads[0]
+        assert spread.score == 85.5
+        assert spread.probability_profit == 0.65
+        assert spread.long_leg.strike == 150.0
+        assert spread.short_leg.strike == 155.0
                 
-    @pytest.mark.asyncio
-    async def test_scan_retry_on_rate_limit(self):
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_scan_retry_on_rate_limit(self, scanner_client, scanner_routes):
         """Test retry logic on rate limit"""
-        async with ScannerClient(max_retries=2) as client:
-            request = ScanRequest(symbol="SPY", filters=[], limit=10)
-            
-            # Mock rate limit response then success
-            call_count = 0
-            
-            async def mock_post(*args, **kwargs):
-                nonlocal call_count
-                call_count += 1
-                
-                if call_count == 1:
-                    # First call: rate limited
-                    response = Mock()
-                    response.status_code = 429
-                    raise httpx.HTTPStatusError(
-                        "Rate limited",
-                        request=Mock(),
-                        response=response
-                    )
-                else:
-                    # Second call: success
-                    response = Mock()
-                    response.json.return_value = {"spreads": []}
-                    response.raise_for_status = Mock()
-                    return response
-                    
-            with patch.object(client._client, 'post', mock_post):
-                spreads = await client.scan(request)
-                
-                assert call_count == 2
-                assert spreads == []
+        # Rate limit response then success
+        calls = itertools.count()
+        responses = (httpx.Response(429), httpx.Response(200, json={"spreads": []}))
+        scanner_routes.handler = lambda request: responses[next(calls)]
+        
+        request = ScanRequest(symbol="SPY", filters=[], limit=10)
+        
+        spreads = await scanner_client.scan(request)
+        
+        assert next(calls) == 2
+        assert spreads == []
+        
+    def test_scan_filter_hashable(self):
+        """Test filters can be used as set members and dict keys"""
+        cached = DELTA_30_40[0]
+        plain = ScanFilter(type=FilterType.DELTA, params={"min": 0.3, "max": 0.4})
+        
+        assert cached == plain
+        assert hash(cached) == hash(plain)
+        assert len({cached, plain, *DELTA_25_35}) == 2
+        assert {cached: "delta"}[plain] == "delta"
 
 
 class TestBackpressureHandler:
@@ -155,10 +157,12 @@ class TestBackpressureHandler:
     @pytest.mark.asyncio
     async def test_token_bucket_rate_limiting(self):
         """Test token bucket rate limiting"""
+        # Frozen clock: no refill between acquires
         handler = BackpressureHandler(
             strategy=BackpressureStrategy.TOKEN_BUCKET,
             requests_per_second=5.0,
-            burst_size=10
+            burst_size=10,
+            clock=lambda: 0.0
         )
         
         # Should allow burst
@@ -172,12 +176,43 @@ class TestBackpressureHandler:
         # Next should fail (tokens exhausted)
         assert not await handler.acquire()
         
+    @pytest.mark.asyncio
+    async def test_acquire_many_is_all_or_nothing(self):
+        """Test batch acquire never partially drains the bucket"""
+        handler = BackpressureHandler(
+            strategy=BackpressureStrategy.TOKEN_BUCKET,
+            requests_per_second=5.0,
+            burst_size=10,
+            clock=lambda: 0.0
+        )
+        
+        assert await handler.acquire_many(4)
+        assert not await handler.acquire_many(7)  # only 6 left
+        assert handler.tokens == 6
+        assert await handler.acquire_many(6)
+        assert not await handler.acquire()
+        
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("strategy", [
+        BackpressureStrategy.SLIDING_WINDOW,
+        BackpressureStrategy.FIXED_WINDOW,
+        BackpressureStrategy.ADAPTIVE,
+    ])
+    async def test_acquire_many_requires_token_bucket(self, strategy):
+        """Test batch acquire refuses strategies it would bypass"""
+        handler = BackpressureHandler(strategy=strategy, clock=lambda: 0.0)
+        
+        with pytest.raises(ValueError):
+            await handler.acquire_many(2)
+        
     @pytest.mark.asyncio
     async def test_circuit_breaker(self):
         """Test circuit breaker functionality"""
+        fake_now = [0.0]
         handler = BackpressureHandler(
             circuit_breaker_threshold=3,
-            circuit_breaker_timeout=1
+            circuit_breaker_timeout=1,
+            clock=lambda: fake_now[0]
         )
         
         # Record failures
@@ -187,8 +222,8 @@ class TestBackpressureHandler:
         # Circuit should be open
         assert not await handler.acquire()
         
-        # Wait for timeout
-        await asyncio.sleep(1.1)
+        # Advance past the timeout
+        fake_now[0] += 1.2
         
         # Circuit should be closed
         assert await handler.acquire()
@@ -222,16 +257,12 @@ class TestScannerCoordinator:
     @pytest.mark.asyncio
     async def test_scan_with_cache(self):
         """Test scanning with cache"""
-        # Mock dependencies
-        mock_ibkr = Mock()
-        mock_ibkr.emit_event = AsyncMock()
-        
-        mock_scanner = Mock()
-        mock_scanner.scan = AsyncMock(return_value=[])
+        # Stub dependencies
+        scanner = _StubScanner()
         
         coordinator = ScannerCoordinator(
-            ibkr_connection=mock_ibkr,
-            scanner_client=mock_scanner,
+            ibkr_connection=_StubIBKR(),
+            scanner_client=scanner,
             scan_cache_ttl=60
         )
         
@@ -239,16 +270,14 @@ class TestScannerCoordinator:
         
         try:
             # First scan
-            filters = [
-                ScanFilter(FilterType.DELTA, {"min": 0.3, "max": 0.4})
-            ]
+            filters = [*DELTA_30_40]
             
             result1 = await coordinator.scan_symbol("TSLA", filters)
-            assert mock_scanner.scan.call_count == 1
+            assert scanner.calls == 1
             
             # Second scan (should hit cache)
             result2 = await coordinator.scan_symbol("TSLA", filters)
-            assert mock_scanner.scan.call_count == 1  # No new call
+            assert scanner.calls == 1  # No new call
             assert coordinator.metrics["cache_hits"] == 1
             
         finally:
@@ -257,36 +286,52 @@ class TestScannerCoordinator:
     @pytest.mark.asyncio
     async def test_concurrent_scan_limiting(self):
         """Test concurrent scan limiting"""
-        mock_ibkr = Mock()
-        mock_ibkr.emit_event = AsyncMock()
-        
-        # Mock scanner with delay
-        async def slow_scan(*args, **kwargs):
-            await asyncio.sleep(0.1)
-            return []
-            
-        mock_scanner = Mock()
-        mock_scanner.scan = slow_scan
+        # Stub scanner that holds each scan until the test releases it
+        release = asyncio.Event()
+        scanner = _StubScanner(release=release)
         
         coordinator = ScannerCoordinator(
-            ibkr_connection=mock_ibkr,
-            scanner_client=mock_scanner,
+            ibkr_connection=_StubIBKR(),
+            scanner_client=scanner,
             max_concurrent_scans=2
         )
         
+        completed = []
+        all_completed = asyncio.Event()
+        
+        def track(job):
+            if job.status == "completed":
+                completed.append(job.id)
+                if len(completed) == 5:
+                    all_completed.set()
+        
+        coordinator.on_state_change = track
         await coordinator.start()
         
         try:
-            # Submit multiple scans
-            tasks = []
-            for i in range(5):
-                task = asyncio.create_task(
-                    coordinator.scan_symbol(f"STOCK{i}", [])
-                )
-                tasks.append(task)
+            async with asyncio.TaskGroup() as tg:
+                for i in range(5):
+                    tg.create_task(coordinator.scan_symbol(f"STOCK{i}", []))
                 
-            # Should process with max 2 concurrent
-            await asyncio.gather(*tasks)
+                # Two scans reach the scanner and are held there
+                async with scanner.entered:
+                    await asyncio.wait_for(
+                        scanner.entered.wait_for(lambda: scanner.in_flight == 2),
+                        timeout=5.0
+                    )
+                for _ in range(10):
+                    await asyncio.sleep(0)  # give a third scan the chance to slip in
+                
+                # The limit holds and the remaining jobs are still queued
+                assert scanner.max_in_flight == 2
+                assert scanner.calls == 2
+                pending = [j for j in coordinator.active_jobs.values() if j.status == "pending"]
+                assert len(pending) == 3
+                
+                release.set()
+            
+            await asyncio.wait_for(all_completed.wait(), timeout=5.0)
+            assert scanner.max_in_flight == 2
             
             # Check metrics
             metrics = coordinator.get_metrics()
@@ -298,32 +343,17 @@ class TestScannerCoordinator:
     @pytest.mark.asyncio
     async def test_scan_job_lifecycle(self):
         """Test scan job lifecycle tracking"""
-        mock_ibkr = Mock()
-        mock_ibkr.emit_event = AsyncMock()
-        
-        mock_scanner = Mock()
-        mock_scanner.scan = AsyncMock(return_value=[])
-        
         coordinator = ScannerCoordinator(
-            ibkr_connection=mock_ibkr,
-            scanner_client=mock_scanner
+            ibkr_connection=_StubIBKR(),
+            scanner_client=_StubScanner()
         )
         
         await coordinator.start()
         
         try:
-            # Track job states
+            # Track job state changes
             job_states = []
-            
-            # Patch to track job state changes
-            original_process = coordinator._process_scan_job
-            
-            async def track_process(job):
-                job_states.append(job.status)
-                await original_process(job)
-                job_states.append(job.status)
-                
-            coordinator._process_scan_job = track_process
+            coordinator.on_state_change = lambda job: job_states.append(job.status)
             
             # Run scan
             await coordinator.scan_symbol("AMD", [])
@@ -342,55 +372,26 @@ class TestIntegration:
     
     @pytest.mark.asyncio
     @pytest.mark.integration
-    async def test_full_scan_flow(self):
+    async def test_full_scan_flow(self, scanner_available):
         """Test complete scan flow from request to response"""
         # This test requires the Go scanner to be running
-        # Skip if not in integration test mode
-        
-        try:
-            # Check if scanner is available
-            async with httpx.AsyncClient() as client:
-                response = await client.get("http://localhost:8080/health")
-                if response.status_code != 200:
-                    pytest.skip("Scanner service not available")
-        except:
+        if not scanner_available:
             pytest.skip("Scanner service not available")
             
         # Run actual integration test
-        mock_ibkr = Mock()
-        mock_ibkr.emit_event = AsyncMock()
-        
         async with ScannerClient() as scanner_client:
             coordinator = ScannerCoordinator(
-                ibkr_connection=mock_ibkr,
+                ibkr_connection=_StubIBKR(),
                 scanner_client=scanner_client
             )
             
             await coordinator.start()
             
             try:
-                # Create realistic filters
-                filters = [
-                    ScanFilter(
-                        type=FilterType.DELTA,
-                        params={"min": 0.2, "max": 0.4}
-                    ),
-                    ScanFilter(
-                        type=FilterType.DTE,
-                        params={"min": 30, "max": 90}
-                    ),
-                    ScanFilter(
-                        type=FilterType.LIQUIDITY,
-                        params={
-                            "min_volume": 100,
-                            "min_open_interest": 500,
-                            "max_bid_ask_spread": 0.15
-                        }
-                    )
-                ]
-                
-                # Run scan
-                spreads = await coordinator.scan_symbol("SPY", filters)
+                # Run scan with realistic filters
+                spreads = await coordinator.scan_symbol(
+                    "SPY", [*DELTA_20_40, *DTE_30_90, *LIQ_FILTERS]
+                )
                 
                 # Verify results
                 assert isinstance(spreads, list)
@@ -412,10 +413,114 @@ class TestIntegration:
 
 
 # Fixtures
-@pytest.fixture
+def _json_bytes(data) -> bytes:
+    """Serialize a (possibly frozen) canned payload to a JSON response body"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data, default=dict)
+    return json.dumps(data, default=dict).encode()
+
+
+class _ScannerRoutes:
+    """MockTransport handler that forwards to whatever the current test installs"""
+    
+    def __init__(self):
+        self.handler = None
+        
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        return self.handler(request)
+
+
+@pytest.fixture(scope="session")
+def scanner_available():
+    """Whether the Go scanner answers its health check; probed once per session"""
+    try:
+        return httpx.get(f"{SCANNER_URL}/health", timeout=0.5).status_code == 200
+    except httpx.HTTPError:
+        return False
+
+
+@pytest.fixture(scope="module")
+def scanner_routes():
+    """Swappable request handler behind the shared scanner client"""
+    return _ScannerRoutes()
+
+
+@pytest_asyncio.fixture(scope="module", loop_scope="module")
+async def scanner_client(scanner_routes):
+    """One ScannerClient (and connection pool) for the whole module"""
+    async with ScannerClient(transport=httpx.MockTransport(scanner_routes)) as client:
+        yield client
+
+
+@pytest.fixture(autouse=True)
+def _reset_routes(scanner_routes):
+    """Drop the previous test's handler so no test sees stale responses"""
+    yield
+    scanner_routes.handler = None
+
+
+def _freeze(data):
+    """Read-only view of a nested canned payload, shared safely across tests"""
+    if isinstance(data, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in data.items()})
+    if isinstance(data, list):
+        return tuple(_freeze(v) for v in data)
+    return data
+
+
+@pytest.fixture(scope="module")
+def mock_spread_data():
+    """Canned AAPL call spread as returned by the scanner"""
+    return _freeze({
+        "long_leg": {
+            "symbol": "AAPL",
+            "expiry": "2025-02-21",
+            "strike": 150.0,
+            "right": "C",
+            "delta": 0.30,
+            "theta": -0.05,
+            "vega": 0.15,
+            "iv": 0.25,
+            "volume": 1000,
+            "open_interest": 5000,
+            "bid": 5.50,
+            "ask": 5.60,
+            "last": 5.55
+        },
+        "short_leg": {
+            "symbol": "AAPL",
+            "expiry": "2025-02-21",
+            "strike": 155.0,
+            "right": "C",
+            "delta": 0.20,
+            "theta": -0.04,
+            "vega": 0.12,
+            "iv": 0.24,
+            "volume": 800,
+            "open_interest": 4000,
+            "bid": 3.20,
+            "ask": 3.30,
+            "last": 3.25
+        },
+        "net_debit": 2.30,
+        "max_profit": 2.70,
+        "max_loss": 2.30,
+        "breakeven": 152.30,
+        "probability_profit": 0.65,
+        "score": 85.5
+    })
+
+
+@pytest.fixture(scope="module")
+def canned_spread_body(mock_spread_data):
+    """Scanner response body wrapping mock_spread_data, serialized once"""
+    return _json_bytes({"spreads": [mock_spread_data]})
+
+
+@pytest.fixture(scope="module")
 def mock_scanner_response():
     """Fixture for mock scanner response"""
-    return {
+    return _freeze({
         "spreads": [
             {
                 "long_leg": {
@@ -456,7 +561,7 @@ def mock_scanner_response():
                 "score": 75.0
             }
         ]
-    }
+    })
 
 
 if __name__ == "__main__":
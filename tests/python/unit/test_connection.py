@@ -8,6 +8,7 @@ actual TWS connectivity.
 
 import pytest
 import asyncio
+from dataclasses import replace
 from unittest.mock import Mock, AsyncMock, patch, MagicMock
 from datetime import datetime
 
@@ -16,18 +17,70 @@ from src.python.ibkr_connector.exceptions import ConnectionError, ConfigurationE
 from src.python.config.settings import Config, ConnectionConfig
 
 
+@pytest.fixture(scope="session")
+def _base_config():
+    """Test configuration template, built once per session (do not mutate)."""
+    return Config()
+
+
+FIXED_NOW = datetime(2025, 1, 13, 9, 30)
+
+
+@pytest.fixture
+def frozen_now(monkeypatch):
+    """Pin ConnectionManager's wall clock to FIXED_NOW."""
+    monkeypatch.setattr(ConnectionManager, '_now', staticmethod(lambda: FIXED_NOW))
+    return FIXED_NOW
+
+
+@pytest.fixture(scope="session")
+def _async_mock_pool():
+    """Prebuilt AsyncMocks shared across the session (reset before each use)."""
+    return {
+        name: AsyncMock()
+        for name in ('connectAsync', 'reqCurrentTimeAsync', 'connect', 'disconnect')
+    }
+
+
+@pytest.fixture
+def async_mock(_async_mock_pool, monkeypatch):
+    """Install a freshly reset pooled AsyncMock as ``target.<name>``."""
+    def install(target, name):
+        mock = _async_mock_pool[name]
+        mock.reset_mock(return_value=True, side_effect=True)
+        monkeypatch.setattr(target, name, mock)
+        return mock
+    
+    return install
+
+
+@pytest.fixture
+def event_capture():
+    """List of received event payloads and an async handler that fills it."""
+    events = []
+    
+    async def capture_event(event_data):
+        events.append(event_data)
+    
+    return events, capture_event
+
+
 class TestConnectionManager:
     """Test cases for ConnectionManager."""
     
     @pytest.fixture
-    def config(self):
+    def config(self, _base_config):
         """Create test configuration."""
-        config = Config()
-        config.connection.host = "localhost"
-        config.connection.port = 7497
-        config.connection.client_id = 999
-        config.connection.timeout = 5.0
-        return config
+        return replace(
+            _base_config,
+            connection=replace(
+                _base_config.connection,
+                host="localhost",
+                port=7497,
+                client_id=999,
+                timeout=5.0
+            )
+        )
     
     @pytest.fixture
     def manager(self, config):
@@ -51,91 +104,108 @@ class TestConnectionManager:
             ConnectionManager(config)
     
     @pytest.mark.asyncio
-    async def test_connect_success(self, manager):
+    async def test_connect_success(self, manager, async_mock, event_capture, frozen_now):
         """Test successful connection."""
         # Mock IB.connectAsync
-        with patch.object(manager.ib, 'connectAsync', new_callable=AsyncMock) as mock_connect:
-            mock_connect.return_value = None
+        mock_connect = async_mock(manager.ib, 'connectAsync')
+        mock_connect.return_value = None
+        
+        # Mock isConnected to return True after connection
+        with patch.object(manager.ib, 'isConnected', return_value=True):
+            # Track emitted events
+            events, capture_event = event_capture
+            manager.event_manager.on('connection_established', capture_event)
+            
+            # Connect
+            await manager.connect()
+            
+            # Verify connection was attempted
+            mock_connect.assert_called_once_with(
+                host="localhost",
+                port=7497,
+                clientId=999,
+                timeout=5.0
+            )
             
-            # Mock isConnected to return True after connection
-            with patch.object(manager.ib, 'isConnected', return_value=True):
-                # Track emitted events
-                events = []
-                async def capture_event(event_data):
-                    events.append(event_data)
-                
-                manager.event_manager.on('connection_established', capture_event)
-                
-                # Connect
-                await manager.connect()
-                
-                # Verify connection was attempted
-                mock_connect.assert_called_once_with(
-                    host="localhost",
-                    port=7497,
-                    clientId=999,
-                    timeout=5.0
-                )
-                
-                # Verify state changes
-                assert manager.state == ConnectionState.CONNECTED
-                assert manager.is_connected()
-                assert manager._connected_time is not None
-                assert manager._reconnect_count == 0
-                
-                # Verify event was emitted
-                assert len(events) == 1
-                assert events[0]['host'] == "localhost"
-                assert events[0]['port'] == 7497
-                assert events[0]['client_id'] == 999
+            # Verify state changes
+            assert manager.state == ConnectionState.CONNECTED
+            assert manager.is_connected()
+            assert manager._connected_time == frozen_now
+            assert manager._reconnect_count == 0
+            
+            # Heartbeat confirmation is opt-in
+            assert manager._heartbeat_task is None
+            
+            # Verify event was emitted
+            assert len(events) == 1
+            assert events[0]['host'] == "localhost"
+            assert events[0]['port'] == 7497
+            assert events[0]['client_id'] == 999
+            assert events[0]['timestamp'] == frozen_now
     
     @pytest.mark.asyncio
-    async def test_connect_already_connected(self, manager):
-        """Test connecting when already connected."""
-        manager.state = ConnectionState.CONNECTED
+    async def test_heartbeat_event_after_connect(self, manager, async_mock):
+        """Test heartbeat_event is set once TWS answers after connecting."""
+        async_mock(manager.ib, 'connectAsync')
+        mock_time = async_mock(manager.ib, 'reqCurrentTimeAsync')
         
-        with patch.object(manager.ib, 'connectAsync', new_callable=AsyncMock) as mock_connect:
-            await manager.connect()
-            
-            # Should not attempt to connect again
-            mock_connect.assert_not_called()
+        await manager.connect(confirm_heartbeat=True)
+        await asyncio.wait_for(manager.heartbeat_event.wait(), timeout=1.0)
+        
+        mock_time.assert_called_once()
+        
+        with patch.object(manager.ib, 'disconnect'):
+            await manager.disconnect()
+        assert not manager.heartbeat_event.is_set()
     
     @pytest.mark.asyncio
-    async def test_connect_timeout(self, manager):
-        """Test connection timeout."""
-        with patch.object(manager.ib, 'connectAsync', new_callable=AsyncMock) as mock_connect:
-            mock_connect.side_effect = asyncio.TimeoutError()
-            
-            with pytest.raises(ConnectionError) as exc_info:
-                await manager.connect()
-            
-            assert "Connection timeout" in str(exc_info.value)
-            assert manager.state == ConnectionState.ERROR
+    async def test_heartbeat_opt_in_via_constructor(self, config, async_mock):
+        """Test async with confirms the heartbeat when the manager opts in."""
+        manager = ConnectionManager(config, confirm_heartbeat=True)
+        async_mock(manager.ib, 'connectAsync')
+        mock_time = async_mock(manager.ib, 'reqCurrentTimeAsync')
+        
+        with patch.object(manager.ib, 'disconnect'):
+            async with manager:
+                await asyncio.wait_for(manager.heartbeat_event.wait(), timeout=1.0)
+        
+        mock_time.assert_called_once()
     
     @pytest.mark.asyncio
-    async def test_connect_failure(self, manager):
-        """Test connection failure."""
-        with patch.object(manager.ib, 'connectAsync', new_callable=AsyncMock) as mock_connect:
-            mock_connect.side_effect = Exception("Network error")
-            
-            with pytest.raises(ConnectionError) as exc_info:
-                await manager.connect()
-            
-            assert "Failed to connect" in str(exc_info.value)
-            assert manager.state == ConnectionState.ERROR
+    async def test_connect_already_connected(self, manager, async_mock):
+        """Test connecting when already connected."""
+        manager.state = ConnectionState.CONNECTED
+        mock_connect = async_mock(manager.ib, 'connectAsync')
+        
+        await manager.connect()
+        
+        # Should not attempt to connect again
+        mock_connect.assert_not_called()
     
     @pytest.mark.asyncio
-    async def test_disconnect(self, manager):
+    @pytest.mark.parametrize("exc,msg", [
+        (asyncio.TimeoutError(), "Connection timeout"),
+        (Exception("Network error"), "Failed to connect"),
+    ], ids=["timeout", "failure"])
+    async def test_connect_error(self, manager, async_mock, exc, msg):
+        """Test connection timeout and failure."""
+        async_mock(manager.ib, 'connectAsync').side_effect = exc
+        
+        with pytest.raises(ConnectionError) as exc_info:
+            await manager.connect()
+        
+        assert msg in str(exc_info.value)
+        assert manager.state == ConnectionState.ERROR
+    
+    @pytest.mark.asyncio
+    async def test_disconnect(self, manager, event_capture, frozen_now):
         """Test disconnection."""
         # Set up as connected
         manager.state = ConnectionState.CONNECTED
-        manager._connected_time = datetime.now()
+        manager._connected_time = frozen_now
         
         # Track events
-        events = []
-        async def capture_event(event_data):
-            events.append(event_data)
-        
+        events, capture_event = event_capture
         manager.event_manager.on('connection_closed', capture_event)
         
         with patch.object(manager.ib, 'disconnect') as mock_disconnect:
@@ -147,25 +217,41 @@ class TestConnectionManager:
             
             # Verify event
             assert len(events) == 1
-            assert 'timestamp' in events[0]
+            assert events[0]['timestamp'] == frozen_now
     
     @pytest.mark.asyncio
-    async def test_ensure_connected_when_disconnected(self, manager):
+    async def test_ensure_connected_when_disconnected(self, manager, async_mock):
         """Test ensure_connected reconnects when disconnected."""
         manager.state = ConnectionState.DISCONNECTED
+        mock_connect = async_mock(manager, 'connect')
         
-        with patch.object(manager, 'connect', new_callable=AsyncMock) as mock_connect:
-            await manager.ensure_connected()
-            mock_connect.assert_called_once()
+        await manager.ensure_connected()
+        mock_connect.assert_called_once()
     
     @pytest.mark.asyncio
-    async def test_ensure_connected_when_connected(self, manager):
+    async def test_ensure_connected_when_connected(self, manager, async_mock):
         """Test ensure_connected does nothing when already connected."""
         manager.state = ConnectionState.CONNECTED
+        mock_connect = async_mock(manager, 'connect')
         
-        with patch.object(manager, 'connect', new_callable=AsyncMock) as mock_connect:
-            await manager.ensure_connected()
-            mock_connect.assert_not_called()
+        await manager.ensure_connected()
+        mock_connect.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_async_context_manager(self, manager, async_mock):
+        """Test async with connects on entry and disconnects on exit."""
+        mock_connect = async_mock(manager, 'connect')
+        mock_disconnect = async_mock(manager, 'disconnect')
+        
+        with pytest.raises(RuntimeError):
+            async with manager as entered:
+                assert entered is manager
+                mock_connect.assert_called_once()
+                mock_disconnect.assert_not_called()
+                raise RuntimeError("boom")
+        
+        # Cleanup runs even when the body raises
+        mock_disconnect.assert_called_once()
     
     def test_connection_info(self, manager):
         """Test connection info property."""
@@ -179,29 +265,23 @@ class TestConnectionManager:
         assert info['server_version'] is None
     
     @pytest.mark.asyncio
-    async def test_error_event_handler(self, manager):
+    async def test_error_event_handler(self, manager, event_capture):
         """Test error event handling."""
-        events = []
-        async def capture_event(event_data):
-            events.append(event_data)
-        
+        events, capture_event = event_capture
         manager.event_manager.on('error_occurred', capture_event)
         
-        # Simulate error event
-        manager._on_error(reqId=123, errorCode=100, errorString="Pacing violation")
-        
-        # Wait for async event processing
-        await asyncio.sleep(0.1)
+        # Simulate error event and wait for its emission to finish
+        await manager._on_error(reqId=123, errorCode=100, errorString="Pacing violation")
         
         assert len(events) == 1
         assert events[0]['req_id'] == 123
         assert events[0]['error_code'] == 100
         assert events[0]['error_string'] == "Pacing violation"
     
-    def test_disconnected_event_handler(self, manager):
+    def test_disconnected_event_handler(self, manager, frozen_now):
         """Test disconnected event handling."""
         manager.state = ConnectionState.CONNECTED
-        manager._connected_time = datetime.now()
+        manager._connected_time = frozen_now
         
         manager._on_disconnected()
         
@@ -9,19 +9,25 @@ from datetime import datetime
 from src.python.ibkr_connector.events import EventManager, Events
 
 
+@pytest.fixture(scope="module")
+def event_manager():
+    """Event manager shared by the module; reset after every test."""
+    return EventManager()
+
+
+@pytest.fixture(autouse=True)
+def _reset_event_manager(event_manager):
+    yield
+    event_manager.reset()
+
+
 class TestEventManager:
     """Test cases for EventManager."""
     
-    @pytest.fixture
-    def event_manager(self):
-        """Create event manager instance."""
-        return EventManager()
-    
     def test_initialization(self, event_manager):
         """Test event manager initialization."""
-        assert event_manager._handlers == {}
-        assert event_manager._async_handlers == {}
-        assert event_manager._event_history == []
+        assert event_manager.handler_count() == {}
+        assert list(event_manager._event_history) == []
         assert event_manager._history_limit == 1000
     
     def test_register_sync_handler(self, event_manager):
@@ -30,7 +36,6 @@ class TestEventManager:
             pass
         
         event_manager.on('test_event', handler)
-        assert handler in event_manager._handlers['test_event']
         assert event_manager.handler_count('test_event') == {'test_event': 1}
     
     def test_register_async_handler(self, event_manager):
@@ -39,7 +44,6 @@ class TestEventManager:
             pass
         
         event_manager.on('test_event', handler)
-        assert handler in event_manager._async_handlers['test_event']
         assert event_manager.handler_count('test_event') == {'test_event': 1}
     
     def test_unregister_handler(self, event_manager):
@@ -50,7 +54,6 @@ class TestEventManager:
         event_manager.on('test_event', handler)
         event_manager.off('test_event', handler)
         
-        assert handler not in event_manager._handlers['test_event']
         assert event_manager.handler_count('test_event') == {'test_event': 0}
     
     @pytest.mark.asyncio
@@ -149,8 +152,8 @@ class TestEventManager:
         """Test that history respects size limit."""
         event_manager._history_limit = 5
         
-        for i in range(10):
-            await event_manager.emit('test', {'index': i})
+        # Emissions are scheduled in order, so history order is preserved
+        await asyncio.gather(*(event_manager.emit('test', {'index': i}) for i in range(10)))
         
         history = event_manager.get_history()
         assert len(history) == 5
@@ -159,9 +162,21 @@ class TestEventManager:
     
     def test_clear_history(self, event_manager):
         """Test clearing event history."""
-        event_manager._event_history = [{'test': 'data'}]
+        event_manager._event_history.append({'test': 'data'})
         event_manager.clear_history()
-        assert event_manager._event_history == []
+        assert len(event_manager._event_history) == 0
+    
+    def test_reset(self, event_manager):
+        """Test reset drops handlers and history and restores the limit."""
+        event_manager.on('test_event', lambda data: None)
+        event_manager._add_to_history('test_event', {})
+        event_manager._history_limit = 5
+        
+        event_manager.reset()
+        
+        assert event_manager.handler_count() == {}
+        assert len(event_manager._event_history) == 0
+        assert event_manager._history_limit == 1000
     
     def test_handler_count(self, event_manager):
         """Test handler counting."""
@@ -4,20 +4,51 @@ Unit tests for rate limiting functionality.
 
 import pytest
 import asyncio
-import time
 from unittest.mock import patch
 
 from src.python.ibkr_connector.rate_limiter import RateLimiter, RequestStats
 from src.python.ibkr_connector.exceptions import RateLimitError
 from src.python.config.settings import RateLimitConfig
 
+# Fragments expected in repr() of the 10 req/sec test limiter
+REPR_PARTS = ("RateLimiter", "10.0 req/sec", "tokens=")
+
+# Captured before any test patches asyncio.sleep
+_real_sleep = asyncio.sleep
+
+
+class FakeClock:
+    """Virtual monotonic clock; advances only when told to."""
+    
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+    
+    def __call__(self) -> float:
+        return self.now
+    
+    def advance(self, dt: float) -> None:
+        self.now += dt
+
+
+@pytest.fixture
+def fake_clock(monkeypatch):
+    """Virtual clock; asyncio.sleep advances it instead of waiting."""
+    clock = FakeClock()
+    
+    async def fake_sleep(delay, *args, **kwargs):
+        clock.advance(delay)
+        await _real_sleep(0)  # still yield to the loop
+    
+    monkeypatch.setattr(asyncio, "sleep", fake_sleep)
+    return clock
+
 
 class TestRateLimiter:
     """Test cases for RateLimiter."""
     
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def config(self):
-        """Create test rate limit config."""
+        """Create test rate limit config (shared; do not mutate)."""
         return RateLimitConfig(
             max_requests_per_second=10.0,  # Lower rate for testing
             burst_size=5,
@@ -25,9 +56,9 @@ class TestRateLimiter:
         )
     
     @pytest.fixture
-    def rate_limiter(self, config):
-        """Create rate limiter with test config."""
-        return RateLimiter(config)
+    def rate_limiter(self, config, fake_clock):
+        """Create rate limiter with test config on the virtual clock."""
+        return RateLimiter(config, clock=fake_clock)
     
     def test_initialization(self, rate_limiter, config):
         """Test rate limiter initialization."""
@@ -51,28 +82,55 @@ class TestRateLimiter:
     async def test_acquire_multiple_fast(self, rate_limiter):
         """Test acquiring multiple tokens quickly."""
         # Acquire 5 tokens rapidly
-        wait_times = []
-        for _ in range(5):
-            wait_time = await rate_limiter.acquire()
-            wait_times.append(wait_time)
+        wait_times = await asyncio.gather(*(rate_limiter.acquire() for _ in range(5)))
         
         # First few should be immediate (burst capacity)
         assert wait_times[0] == 0.0
         assert rate_limiter.stats.total_requests == 5
     
     @pytest.mark.asyncio
-    async def test_acquire_with_wait(self, rate_limiter):
+    async def test_fast_path_yields_to_lock_holder(self, rate_limiter):
+        """Test a free token is not taken while another caller holds the lock."""
+        async with rate_limiter._lock:
+            task = asyncio.create_task(rate_limiter.acquire())
+            await asyncio.sleep(0)
+            assert not task.done()
+        
+        assert await task == 0.0
+        assert rate_limiter.stats.total_requests == 1
+    
+    @pytest.mark.asyncio
+    async def test_newcomer_does_not_overtake_queued_waiter(self, rate_limiter):
+        """Test a caller arriving after a release queues behind earlier waiters."""
+        order = []
+        
+        async def request(name):
+            await rate_limiter.acquire()
+            order.append(name)
+        
+        async with rate_limiter._lock:
+            queued = asyncio.create_task(request("queued"))
+            await asyncio.sleep(0)
+        
+        # The lock is free but the queued waiter has not run yet
+        await request("newcomer")
+        await queued
+        
+        assert order == ["queued", "newcomer"]
+    
+    @pytest.mark.asyncio
+    async def test_acquire_with_wait(self, rate_limiter, fake_clock):
         """Test acquiring when tokens need to be refilled."""
         # Consume all tokens
         rate_limiter._tokens = 0.5  # Less than 1 token
         
-        start = time.monotonic()
+        start = fake_clock.now
         wait_time = await rate_limiter.acquire()
-        elapsed = time.monotonic() - start
+        elapsed = fake_clock.now - start
         
-        # Should have waited for tokens
-        assert wait_time > 0
-        assert elapsed >= wait_time
+        # Should have waited for half a token at 10/sec
+        assert wait_time == pytest.approx(0.05)
+        assert elapsed == pytest.approx(wait_time)
         assert rate_limiter.stats.queued_requests == 1
     
     @pytest.mark.asyncio
@@ -89,21 +147,20 @@ class TestRateLimiter:
         assert rate_limiter.stats.rejected_requests == 1
     
     @pytest.mark.asyncio
-    async def test_token_refill(self, rate_limiter):
+    async def test_token_refill(self, rate_limiter, fake_clock):
         """Test token refill mechanism."""
         # Set tokens to half
         rate_limiter._tokens = 5.0
         
-        # Wait for refill
-        await asyncio.sleep(0.1)  # 100ms should add ~1 token at 10/sec
-        
-        # Force refill calculation
-        async with rate_limiter._lock:
-            rate_limiter._refill_tokens()
+        # 100ms adds exactly 1 token at 10/sec
+        fake_clock.advance(0.1)
+        rate_limiter._refill_tokens()
+        assert rate_limiter._tokens == pytest.approx(6.0)
         
-        # Should have more tokens now
-        assert rate_limiter._tokens > 5.0
-        assert rate_limiter._tokens <= 10.0  # Capped at max
+        # Capped at max
+        fake_clock.advance(10.0)
+        rate_limiter._refill_tokens()
+        assert rate_limiter._tokens == 10.0
     
     @pytest.mark.asyncio
     async def test_check_rate(self, rate_limiter):
@@ -118,7 +175,7 @@ class TestRateLimiter:
         assert can_proceed is False
     
     @pytest.mark.asyncio
-    async def test_concurrent_requests(self, rate_limiter):
+    async def test_concurrent_requests(self, rate_limiter, fake_clock):
         """Test handling concurrent requests."""
         # Create multiple concurrent requests
         async def make_request(index):
@@ -126,16 +183,20 @@ class TestRateLimiter:
             return index, wait_time
         
         # Launch 20 concurrent requests (more than burst capacity)
-        tasks = [make_request(i) for i in range(20)]
-        results = await asyncio.gather(*tasks)
+        start = fake_clock.now
+        async with asyncio.TaskGroup() as tg:
+            tasks = [tg.create_task(make_request(i)) for i in range(20)]
+        results = [t.result() for t in tasks]
         
         # Verify all completed
         assert len(results) == 20
         assert rate_limiter.stats.total_requests == 20
         
-        # Some should have waited
+        # 10 starting tokens go out immediately; the other 10 queue at 10/sec
         wait_times = [r[1] for r in results]
-        assert any(w > 0 for w in wait_times)
+        assert wait_times.count(0.0) == 10
+        assert rate_limiter.stats.queued_requests == 10
+        assert fake_clock.now - start == pytest.approx(1.0)
     
     def test_get_stats(self, rate_limiter):
         """Test statistics retrieval."""
@@ -165,20 +226,22 @@ class TestRateLimiter:
         assert len(rate_limiter._request_times) == 0
     
     @pytest.mark.asyncio
-    async def test_current_rate_calculation(self, rate_limiter):
+    async def test_current_rate_calculation(self, rate_limiter, fake_clock):
         """Test current request rate calculation."""
-        # Make several requests
+        # Make several requests, spaced 100ms apart on the virtual clock
         for _ in range(5):
             await rate_limiter.acquire()
-            await asyncio.sleep(0.1)  # Space them out
+            fake_clock.advance(0.1)
         
-        stats = rate_limiter.get_stats()
-        # Current rate should reflect recent requests
-        assert rate_limiter.stats.current_rate >= 0
+        # All five fall within the last second
+        assert rate_limiter.stats.current_rate == 5.0
+        
+        # A virtual second later only the newest request counts
+        fake_clock.advance(1.0)
+        await rate_limiter.acquire()
+        assert rate_limiter.stats.current_rate == 1.0
     
     def test_rate_limiter_repr(self, rate_limiter):
         """Test string representation."""
         repr_str = repr(rate_limiter)
-        assert "RateLimiter" in repr_str
-        assert "10.0 req/sec" in repr_str
-        assert "tokens=" in repr_str
\ No newline at end of file
+        assert all(part in repr_str for part in REPR_PARTS), repr_str
\ No newline at end of file